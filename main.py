@@ -1,13 +1,28 @@
 import pandas as pd
+import numpy as np
+from pandas.tseries.api import guess_datetime_format
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import mysql.connector
 from sqlalchemy import create_engine, URL, text
 import os
+import csv
+import tempfile
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Optional, Union
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import quote_plus
 import re
+import string
+import math
 import time
+import threading
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 
 # Set up logging at the beginning of the script
 logging.basicConfig(
@@ -20,11 +35,165 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Files are parsed and loaded concurrently; the engine pool is sized to match
+MAX_WORKERS = os.cpu_count() or 1
+
+# mysql.connector options for every connection: compressed traffic
+CONNECT_OPTIONS = {'compress': True}
+
+# Narrowest MySQL integer type holding a column's observed range
+INTEGER_TYPES = [(np.int8, "TINYINT"), (np.int16, "SMALLINT"), (np.int32, "INT"), (np.int64, "BIGINT")]
+
+# Integer column types from narrowest to widest, used when widening an existing table
+_INTEGER_RANKS = ["BOOLEAN"] + [sql_type for _, sql_type in INTEGER_TYPES]
+
+# Longest VARCHAR a utf8mb4 column can declare; longer strings become TEXT
+MAX_VARCHAR_LENGTH = 16383
+
+# MySQL's maximum row size; a VARCHAR counts its full utf8mb4 width (4 bytes per character) toward it
+MAX_ROW_BYTES = 65535
+
+# Bytes other column types take toward MAX_ROW_BYTES; TEXT is stored off-row and only counts its pointer
+_COLUMN_BYTES = {"BOOLEAN": 1, "TINYINT": 1, "SMALLINT": 2, "INT": 4, "BIGINT": 8, "DOUBLE": 8, "DATETIME(6)": 8, "TEXT": 12}
+
+# Arrow CSV block size; also the unit in which large CSVs are streamed to MySQL
+CSV_BLOCK_SIZE = 1 << 25
+
+# Column kinds unified across streamed CSV blocks, and the dtype each numeric kind is cast to;
+# a column mixing any other kinds is kept as strings
+_NUMERIC_KINDS = ['bool', 'integer', 'float']
+_KIND_DTYPES = {
+    'bool': pd.ArrowDtype(pa.bool_()),
+    'integer': pd.ArrowDtype(pa.int64()),
+    'float': pd.ArrowDtype(pa.float64()),
+    'datetime': pd.ArrowDtype(pa.timestamp('ns')),
+}
+
+# Strings Arrow's CSV reader reads as missing or boolean; inference on string columns follows
+# the same rules so streamed and whole-file reads type a column alike
+_CSV_DEFAULTS = pacsv.ConvertOptions()
+_NULL_VALUES = _CSV_DEFAULTS.null_values
+_BOOL_VALUES = {**dict.fromkeys(_CSV_DEFAULTS.true_values, True), **dict.fromkeys(_CSV_DEFAULTS.false_values, False)}
+
+# Seconds a new file's size must stay unchanged before it is treated as fully written
+FILE_SETTLE_SECONDS = 1.0
+
+# Cheap pre-check for date-like strings (e.g. 2024-01-31, 31/01/2024, 2024.01.31 10:00)
+_DATE_LIKE = re.compile(r'\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}')
+
+# Patterns shared by the cached identifier sanitizers below
+_NON_WORD = re.compile(r'[^\w]')
+_LEAD_DIGITS = re.compile(r'^\d+')
+
+# For all-ASCII names (the common case) str.translate does the same job as _NON_WORD in C
+_ASCII_NON_WORD = [c for c in map(chr, range(128)) if c not in string.ascii_letters + string.digits + '_']
+_DROP_NON_WORD = str.maketrans({c: None for c in _ASCII_NON_WORD})
+_NON_WORD_TO_UNDERSCORE = str.maketrans({c: '_' for c in _ASCII_NON_WORD})
+
+@lru_cache(maxsize=1024)
+def sanitize_table_name(table_name: str) -> str:
+    """Sanitize the table name to be valid in MySQL"""
+    # Remove all non-alphanumeric characters except underscores
+    if table_name.isascii():
+        sanitized = table_name.translate(_DROP_NON_WORD)
+    else:
+        sanitized = _NON_WORD.sub('', table_name)
+    # Remove leading digits
+    sanitized = _LEAD_DIGITS.sub('', sanitized)
+    # If the name is empty after sanitization, use a default name
+    if not sanitized:
+        sanitized = 'table'
+    # Truncate to 63 characters (MySQL's limit is 64, but we'll add a prefix)
+    sanitized = sanitized[:63]
+    # Ensure the table name is unique by adding a prefix
+    sanitized = f"t_{sanitized}"
+    logger.info(f"Sanitized table name: {table_name} -> {sanitized}")
+    return sanitized
+
+@lru_cache(maxsize=1024)
+def sanitize_column_name(column_name: str) -> str:
+    """Sanitize the column name to be valid in MySQL"""
+    # Replace non-alphanumeric characters with underscores
+    if column_name.isascii():
+        sanitized = column_name.translate(_NON_WORD_TO_UNDERSCORE)
+    else:
+        sanitized = _NON_WORD.sub('_', column_name)
+    # Ensure the column name starts with a letter
+    if not sanitized or not sanitized[0].isalpha():
+        sanitized = 'column_' + sanitized
+    # Truncate to 64 characters (MySQL's limit)
+    return sanitized[:64]
+
+def normalize_mysql_type(column_type: str) -> str:
+    """Map an information_schema COLUMN_TYPE onto the type names create_table_sql emits"""
+    column_type = column_type.upper()
+    if column_type == "TINYINT(1)":
+        return "BOOLEAN"
+    name = column_type.split("(")[0]
+    # Older servers report integer display widths, e.g. INT(11)
+    if name in _INTEGER_RANKS:
+        return name
+    if name.endswith("TEXT"):
+        return "TEXT"
+    return column_type
+
+def widest_mysql_type(a: str, b: str) -> str:
+    """Narrowest of the MySQL types create_table_sql emits that holds the values of both"""
+    if a == b:
+        return a
+    if a in _INTEGER_RANKS and b in _INTEGER_RANKS:
+        return max(a, b, key=_INTEGER_RANKS.index)
+    if {a, b} <= {"DOUBLE", *_INTEGER_RANKS}:
+        return "DOUBLE"
+    if a.startswith("VARCHAR(") and b.startswith("VARCHAR("):
+        return max(a, b, key=lambda sql_type: int(sql_type[len("VARCHAR("):-1]))
+    return "TEXT"
+
+def normalize_header(column_names: Iterable[str]) -> List[str]:
+    """Name CSV header columns the way pd.read_csv does; pyarrow keeps them exactly as written"""
+    # Empty header cells (e.g. a written pandas index) become 'Unnamed: <position>'
+    names = [name or f"Unnamed: {i}" for i, name in enumerate(column_names)]
+    # Repeated names get the first free '.1', '.2', ... suffix
+    taken = set(names)
+    seen = set()
+    for i, name in enumerate(names):
+        if name in seen:
+            suffix = 1
+            while f"{name}.{suffix}" in taken:
+                suffix += 1
+            names[i] = f"{name}.{suffix}"
+            taken.add(names[i])
+        seen.add(names[i])
+    return names
+
+def sanitize_column_names(column_names: Iterable[str]) -> List[str]:
+    """Sanitize a table's column names, keeping them unique for MySQL"""
+    sanitized = []
+    seen = set()
+    for column_name in column_names:
+        name = sanitize_column_name(column_name)
+        # MySQL column names are case-insensitive, so `Name` and `name` collide
+        suffix = 1
+        candidate = name
+        while candidate.lower() in seen:
+            suffix += 1
+            candidate = f"{name[:64 - len(str(suffix)) - 1]}_{suffix}"
+        seen.add(candidate.lower())
+        sanitized.append(candidate)
+    return sanitized
+
 class MySQLTestSetup:
     """Handles MySQL database and test data setup"""
-    def __init__(self, mysql_config: Dict[str, str]):
+    def __init__(self, mysql_config: Dict[str, str], engine=None):
         self.mysql_config = mysql_config
+        self.engine = engine  # Shared engine whose pool is reused for DDL
         self.logger = logger  # Use the global logger
+
+    def connect(self):
+        """Get a DB-API connection, borrowed from the shared pool when available"""
+        if self.engine is not None:
+            return self.engine.raw_connection()
+        return mysql.connector.connect(**self.mysql_config, **CONNECT_OPTIONS, autocommit=True)
         
     def create_database(self):
         """Create test database if it doesn't exist"""
@@ -35,7 +204,9 @@ class MySQLTestSetup:
             conn = mysql.connector.connect(
                 host=config['host'],
                 user=config['user'],
-                password=config['password']
+                password=config['password'],
+                autocommit=True,
+                **CONNECT_OPTIONS
             )
             cursor = conn.cursor()
             cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.mysql_config['database']}")
@@ -46,102 +217,191 @@ class MySQLTestSetup:
             self.logger.error(f"Error creating database: {str(e)}")
             raise
         
-    def create_generic_table(self):
-        """Create a generic table to store data from all files"""
-        try:
-            conn = mysql.connector.connect(**self.mysql_config)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS all_data (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    source_file VARCHAR(255) NOT NULL,
-                    data_column VARCHAR(255) NOT NULL,
-                    data_value TEXT,
-                    inserted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            cursor.close()
-            conn.close()
-            self.logger.info("Generic table 'all_data' created successfully")
-        except Exception as e:
-            self.logger.error(f"Error creating generic table: {str(e)}")
-            raise
-
-    def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str):
+    def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str, size_from_data: bool = True):
         """Create a table based on DataFrame schema if it doesn't exist"""
+        errors = self.create_tables_from_dataframes([(table_name, df)], size_from_data)
+        if errors:
+            raise next(iter(errors.values()))
+
+    def create_tables_from_dataframes(self, items: List[Tuple[str, pd.DataFrame]], size_from_data: bool = True) -> Dict[str, Exception]:
+        """Create tables for several DataFrames over a single connection
+
+        Column types are sized to the DataFrame's values only when size_from_data is set,
+        i.e. when the DataFrame holds the whole file rather than its first chunk.
+        Returns the error for each table that could not be created.
+        """
+        errors = {}
+        conn = self.connect()
         try:
-            conn = mysql.connector.connect(**self.mysql_config)
             cursor = conn.cursor()
             
-            # Sanitize the table name
-            table_name = self.sanitize_table_name(table_name)
-            
-            # Generate CREATE TABLE statement
-            create_table_sql = f"CREATE TABLE IF NOT EXISTS `{table_name}` ("
-            columns = []
-            for column, dtype in df.dtypes.items():
-                sql_type = self.pandas_dtype_to_mysql_type(dtype)
-                column_name = self.sanitize_column_name(column)
-                columns.append(f"`{column_name}` {sql_type}")
-            create_table_sql += ", ".join(columns) + ")"
+            for table_name, df in items:
+                # Sanitize the table name
+                table_name = self.sanitize_table_name(table_name)
+                # A failing table is logged and skipped so the others are still created
+                try:
+                    cursor.execute(self.create_table_sql(df, table_name, size_from_data))
+                    self.logger.info(f"Table {table_name} created successfully")
+                    
+                    # The table may already exist from an earlier file with narrower values
+                    alter_table_sql = self.widen_table_sql(cursor, df, table_name, size_from_data)
+                    if alter_table_sql:
+                        cursor.execute(alter_table_sql)
+                        self.logger.info(f"Table {table_name} widened to fit new data")
+                except Exception as e:
+                    self.logger.error(f"Error creating table {table_name}: {str(e)}")
+                    errors[table_name] = e
             
-            cursor.execute(create_table_sql)
             conn.commit()
             cursor.close()
+        finally:
             conn.close()
-            self.logger.info(f"Table {table_name} created successfully")
-        except Exception as e:
-            self.logger.error(f"Error creating table {table_name}: {str(e)}")
-            raise
+        return errors
+
+    def create_table_sql(self, df: pd.DataFrame, table_name: str, size_from_data: bool = True) -> str:
+        """Generate the CREATE TABLE statement for a DataFrame schema"""
+        create_table_sql = f"CREATE TABLE IF NOT EXISTS `{table_name}` ("
+        sql_types = self.fit_row_size([self.series_to_mysql_type(series, size_from_data) for _, series in df.items()])
+        
+        columns = []
+        column_names = sanitize_column_names(df.columns)
+        for column_name, sql_type in zip(column_names, sql_types):
+            columns.append(f"`{column_name}` {sql_type}")
+        create_table_sql += ", ".join(columns) + ")"
+        return create_table_sql
+
+    def widen_table_sql(self, cursor, df: pd.DataFrame, table_name: str, size_from_data: bool = True) -> Optional[str]:
+        """Generate the ALTER TABLE statement widening an existing table's columns to fit a DataFrame
+
+        Returns None when every column already fits.
+        """
+        cursor.execute(
+            "SELECT COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+            (table_name,)
+        )
+        # Some connector versions return information_schema text as bytes
+        existing = [
+            [value.decode() if isinstance(value, (bytes, bytearray)) else value for value in row]
+            for row in cursor.fetchall()
+        ]
+        column_names = [column_name for column_name, _ in existing]
+        current_types = [normalize_mysql_type(column_type) for _, column_type in existing]
+        
+        # MySQL column names are case-insensitive
+        positions = {column_name.lower(): i for i, column_name in enumerate(column_names)}
+        sql_types = list(current_types)
+        for column_name, (_, series) in zip(sanitize_column_names(df.columns), df.items()):
+            i = positions.get(column_name.lower())
+            if i is not None:
+                sql_types[i] = widest_mysql_type(sql_types[i], self.series_to_mysql_type(series, size_from_data))
+        sql_types = self.fit_row_size(sql_types)
+        
+        changes = [
+            f"MODIFY `{column_name}` {sql_type}"
+            for column_name, sql_type, current_type in zip(column_names, sql_types, current_types)
+            if sql_type != current_type
+        ]
+        if not changes:
+            return None
+        return f"ALTER TABLE `{table_name}` " + ", ".join(changes)
+
+    def fit_row_size(self, sql_types: List[str]) -> List[str]:
+        """Turn VARCHARs into TEXT where a row would exceed MySQL's row size limit"""
+        sql_types = list(sql_types)
+        # Once the VARCHARs would exceed what is left after the other columns and the
+        # null bitmap, the remaining ones become TEXT
+        budget = MAX_ROW_BYTES - math.ceil(len(sql_types) / 8)
+        budget -= sum(_COLUMN_BYTES.get(sql_type, 8) for sql_type in sql_types if not sql_type.startswith("VARCHAR("))
+        for i, sql_type in enumerate(sql_types):
+            if sql_type.startswith("VARCHAR("):
+                width = 4 * int(sql_type[len("VARCHAR("):-1])
+                row_bytes = width + (1 if width <= 255 else 2)
+                if row_bytes > budget:
+                    sql_types[i] = "TEXT"
+                    row_bytes = _COLUMN_BYTES["TEXT"]
+                budget -= row_bytes
+        return sql_types
+
+    def series_to_mysql_type(self, series: pd.Series, size_from_data: bool = True):
+        """Convert a column to the narrowest MySQL type that fits its values
+
+        Without size_from_data only the dtype is used, so the type fits any value of it.
+        """
+        dtype = series.dtype
+        if not size_from_data:
+            return self.pandas_dtype_to_mysql_type(dtype)
+        if pd.api.types.is_bool_dtype(dtype):
+            return "BOOLEAN"
+        elif pd.api.types.is_integer_dtype(dtype):
+            non_null = series.dropna()
+            if not non_null.empty:
+                low, high = non_null.min(), non_null.max()
+                for int_type, sql_type in INTEGER_TYPES:
+                    info = np.iinfo(int_type)
+                    if info.min <= low and high <= info.max:
+                        return sql_type
+        elif pd.api.types.is_string_dtype(dtype):
+            non_null = series.dropna()
+            if non_null.empty:
+                return "TEXT"
+            if dtype == 'object':
+                non_null = non_null.astype(str)
+            # Leave 20% headroom so later files appended to the table rarely need it widened
+            length = max(1, math.ceil(non_null.str.len().max() * 1.2))
+            if length <= MAX_VARCHAR_LENGTH:
+                return f"VARCHAR({length})"
+            return "TEXT"
+        return self.pandas_dtype_to_mysql_type(dtype)
 
     def pandas_dtype_to_mysql_type(self, dtype):
         """Convert pandas dtype to MySQL column type"""
+        if isinstance(dtype, pd.ArrowDtype):
+            return self.arrow_type_to_mysql_type(dtype.pyarrow_dtype)
         if pd.api.types.is_integer_dtype(dtype):
-            return "INT"
+            return "BIGINT"
         elif pd.api.types.is_float_dtype(dtype):
-            return "FLOAT"
+            return "DOUBLE"
         elif pd.api.types.is_bool_dtype(dtype):
             return "BOOLEAN"
         elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return "DATETIME"
-        elif pd.api.types.is_string_dtype(dtype):
-            return "VARCHAR(255)"
+            return "DATETIME(6)"
+        else:
+            return "TEXT"
+
+    def arrow_type_to_mysql_type(self, pa_type: pa.DataType):
+        """Convert a pyarrow type (backing a pd.ArrowDtype) to MySQL column type"""
+        if pa.types.is_integer(pa_type):
+            return "BIGINT"
+        elif pa.types.is_floating(pa_type):
+            return "DOUBLE"
+        elif pa.types.is_boolean(pa_type):
+            return "BOOLEAN"
+        elif pa.types.is_timestamp(pa_type) or pa.types.is_date(pa_type):
+            return "DATETIME(6)"
         else:
             return "TEXT"
 
     def sanitize_table_name(self, table_name: str) -> str:
         """Sanitize the table name to be valid in MySQL"""
-        # Remove all non-alphanumeric characters except underscores
-        sanitized = re.sub(r'[^\w]', '', table_name)
-        # Remove leading digits
-        sanitized = re.sub(r'^\d+', '', sanitized)
-        # If the name is empty after sanitization, use a default name
-        if not sanitized:
-            sanitized = 'table'
-        # Truncate to 63 characters (MySQL's limit is 64, but we'll add a prefix)
-        sanitized = sanitized[:63]
-        # Ensure the table name is unique by adding a prefix
-        sanitized = f"t_{sanitized}"
-        self.logger.info(f"Sanitized table name: {table_name} -> {sanitized}")
-        return sanitized
+        return sanitize_table_name(table_name)
 
     def sanitize_column_name(self, column_name: str) -> str:
         """Sanitize the column name to be valid in MySQL"""
-        # Replace non-alphanumeric characters with underscores
-        sanitized = re.sub(r'[^\w]', '_', column_name)
-        # Ensure the column name starts with a letter
-        if not sanitized[0].isalpha():
-            sanitized = 'column_' + sanitized
-        # Truncate to 64 characters (MySQL's limit)
-        return sanitized[:64]
+        return sanitize_column_name(column_name)
 
 class DataFileProcessor:
     def __init__(self, mysql_config: Dict[str, str], table_name: str):
         self.mysql_config = mysql_config
         self.table_name = table_name
         self.logger = logger  # Use the global logger
+        # One engine per processor so every file reuses pooled connections
+        self.engine = create_engine(
+            self.get_database_url(),
+            pool_pre_ping=True,
+            pool_size=MAX_WORKERS,
+            connect_args={'allow_local_infile': True, **CONNECT_OPTIONS}
+        )
     
     def get_database_url(self) -> str:
         """Create properly formatted database URL"""
@@ -151,8 +411,7 @@ class DataFileProcessor:
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            engine = create_engine(self.get_database_url())
-            with engine.connect() as connection:
+            with self.engine.connect() as connection:
                 self.logger.info("Database connection test successful")
                 return True
         except Exception as e:
@@ -167,88 +426,359 @@ class DataFileProcessor:
             self.logger.error(f"Directory not found: {directory_path}")
             return processed_dfs
         
-        for filename in os.listdir(directory_path):
-            if filename.endswith(('.xlsx', '.xls', '.csv')):
-                file_path = os.path.join(directory_path, filename)
+        filenames = [f for f in os.listdir(directory_path) if f.endswith(('.xlsx', '.xls', '.csv'))]
+        if not filenames:
+            return processed_dfs
+        
+        tables = []
+        # Parsing releases the GIL in pandas' C readers, so files are read in parallel
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(filenames))) as executor:
+            futures = {
+                filename: executor.submit(self.process_file, os.path.join(directory_path, filename))
+                for filename in filenames
+            }
+            for filename, future in futures.items():
                 try:
-                    df = self.process_file(file_path)
+                    df = future.result()
                     if df is not None:
-                        table_name = os.path.splitext(filename)[0]
-                        table_name = MySQLTestSetup(self.mysql_config).sanitize_table_name(table_name)
+                        table_name = sanitize_table_name(os.path.splitext(filename)[0])
                         processed_dfs[table_name] = df
+                        tables.append((os.path.splitext(filename)[0], df))
                         self.logger.info(f"Successfully processed {filename}")
                 except Exception as e:
                     self.logger.error(f"Error processing {filename}: {str(e)}")
                     continue
         
+        # Create every table for this batch over one connection
+        if tables:
+            MySQLTestSetup(self.mysql_config, self.engine).create_tables_from_dataframes(tables)
+        
         return processed_dfs
     
     def process_file(self, file_path: str) -> pd.DataFrame:
         try:
             file_ext = os.path.splitext(file_path)[1].lower()
             if file_ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
+                # calamine parses both .xlsx and .xls natively instead of walking XML in Python
+                df = pd.read_excel(file_path, engine='calamine')
             elif file_ext == '.csv':
-                df = pd.read_csv(file_path)
+                # Arrow's multi-threaded parser infers column types while reading;
+                # the columns stay Arrow-backed instead of becoming Python objects
+                table = pacsv.read_csv(
+                    file_path,
+                    read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+                )
+                df = table.to_pandas(split_blocks=True, self_destruct=True, types_mapper=pd.ArrowDtype)
+                df.columns = normalize_header(df.columns)
             else:
                 raise ValueError(f"Unsupported file format: {file_ext}")
             
-            # Infer and convert data types
-            for column in df.columns:
-                df[column] = self.infer_and_convert_type(df[column])
+            return self.convert_types(df)
             
-            return df
+        except Exception as e:
+            self.logger.error(f"Error processing file {file_path}: {str(e)}")
+            raise
+    
+    def process_file_chunks(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Yield a file as converted DataFrame chunks; CSVs are streamed block by block"""
+        if os.path.splitext(file_path)[1].lower() != '.csv':
+            yield self.process_file(file_path)
+            return
+        
+        try:
+            # Arrow's streaming reader fixes each column's type from the first block, so a later
+            # value of another type (e.g. 1.5 after integers) fails the read. Blocks are read as
+            # strings instead; a first pass infers each column's kind over the whole file and the
+            # second pass converts every block to that kind.
+            kinds = []
+            blocks = 0
+            for block in self.read_csv_blocks(file_path):
+                converted = self.convert_types(block)
+                block_kinds = [self.column_kind(block.iloc[:, i], converted.iloc[:, i]) for i in range(block.shape[1])]
+                kinds = [self.unify_kinds(a, b) for a, b in zip(kinds, block_kinds)] if blocks else block_kinds
+                blocks += 1
+            
+            # A header-only file has no blocks; read it whole so its table is still created
+            if blocks == 0:
+                yield self.process_file(file_path)
+                return
+            
+            # A single block is already consistent with itself
+            if blocks == 1:
+                yield converted
+                return
+            del converted
             
+            for block in self.read_csv_blocks(file_path):
+                yield self.coerce_kinds(block, self.convert_types(block), kinds)
         except Exception as e:
             self.logger.error(f"Error processing file {file_path}: {str(e)}")
             raise
     
+    def read_csv_blocks(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Stream a CSV block by block with every column read as strings"""
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f), [])
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+            convert_options=pacsv.ConvertOptions(column_types={name: pa.string() for name in header})
+        )
+        columns = normalize_header(reader.schema.names)
+        for batch in reader:
+            block = batch.to_pandas(types_mapper=pd.ArrowDtype)
+            block.columns = columns
+            yield block
+    
+    def column_kind(self, raw: pd.Series, converted: pd.Series) -> Optional[str]:
+        """Kind of a converted block column; None when the block holds no values for it"""
+        if converted.isna().all():
+            return None
+        if pd.api.types.is_bool_dtype(converted.dtype):
+            return 'bool'
+        if pd.api.types.is_integer_dtype(converted.dtype):
+            return 'integer'
+        if pd.api.types.is_float_dtype(converted.dtype):
+            return 'float'
+        if pd.api.types.is_datetime64_any_dtype(converted.dtype):
+            # Blocks only agree on dates when they were parsed with the same format
+            return 'datetime:' + guess_datetime_format(str(self.missing_as_null(raw).dropna().iloc[0]))
+        return 'string'
+    
+    def unify_kinds(self, a: Optional[str], b: Optional[str]) -> Optional[str]:
+        """Narrowest kind holding the values of both kinds"""
+        if a is None or a == b:
+            return b
+        if b is None:
+            return a
+        if a in _NUMERIC_KINDS and b in _NUMERIC_KINDS:
+            return max(a, b, key=_NUMERIC_KINDS.index)
+        return 'string'
+    
+    def coerce_kinds(self, raw: pd.DataFrame, converted: pd.DataFrame, kinds: List[Optional[str]]) -> pd.DataFrame:
+        """Convert the columns of a block whose own kind differs from the file's"""
+        for i, kind in enumerate(kinds):
+            if self.column_kind(raw.iloc[:, i], converted.iloc[:, i]) == kind:
+                continue
+            if kind is None or kind == 'string':
+                converted.isetitem(i, raw.iloc[:, i])
+            elif kind.startswith('datetime:'):
+                converted.isetitem(i, self.parse_dates(self.missing_as_null(raw.iloc[:, i]), kind[len('datetime:'):]))
+            else:
+                converted.isetitem(i, converted.iloc[:, i].astype(_KIND_DTYPES[kind]))
+        return converted
+    
+    def convert_types(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normalise a parsed DataFrame's column types"""
+        # Normalise every column to Arrow-backed dtypes in one pass, then only
+        # re-infer the columns that are still plain strings
+        df = df.convert_dtypes(dtype_backend='pyarrow')
+        # Assign by position so repeated column names can't be confused
+        for i, dtype in enumerate(df.dtypes):
+            if pd.api.types.is_string_dtype(dtype):
+                df.isetitem(i, self.infer_and_convert_type(df.iloc[:, i]))
+        return df
+    
     def infer_and_convert_type(self, series: pd.Series) -> pd.Series:
-        if series.dtype == 'object':
-            # Try to convert to datetime
-            try:
-                return pd.to_datetime(series)
-            except ValueError:
-                pass
+        if pd.api.types.is_string_dtype(series.dtype):
+            # Markers such as '' or 'NA' count as missing, as they do for Arrow's CSV type
+            # inference; they are only dropped when the column converts
+            values = self.missing_as_null(series)
+            non_null = values.dropna()
+            if non_null.empty:
+                return series
             
-            # Try to convert to numeric
-            try:
-                return pd.to_numeric(series)
-            except ValueError:
-                pass
+            # A conversion is only kept when every non-null value converts, so no data is lost
+            
+            # Try to convert to numeric (first, so 0/1 columns stay integers)
+            numeric = pd.to_numeric(values, errors='coerce')
+            # Arrow-backed results keep unparseable values as NaN rather than null
+            numeric = numeric.where(numeric == numeric)
+            if numeric.notna().sum() == len(non_null):
+                return numeric
+            
+            # If all values are boolean, convert to boolean
+            # Arrow string columns can only be compared against strings
+            if series.dtype == 'object':
+                bool_values = {True: True, False: False, **_BOOL_VALUES}
+            else:
+                bool_values = _BOOL_VALUES
+            if non_null.isin(list(bool_values)).all():
+                return values.map(bool_values).astype(_KIND_DTYPES['bool'])
             
-            # If it's mostly boolean values, convert to boolean
-            if series.isin([True, False, 'True', 'False', 1, 0]).mean() > 0.8:
-                return series.map({'True': True, 'False': False, '1': True, '0': False})
+            # Only attempt the full datetime parse when a sample looks like dates
+            sample = non_null.head(100).astype(str)
+            if sample.str.match(_DATE_LIKE).mean() > 0.8:
+                # One format, guessed from the first value, is applied to the whole column
+                date_format = guess_datetime_format(sample.iloc[0])
+                if date_format is not None:
+                    parsed = self.parse_dates(values, date_format)
+                    if parsed.notna().sum() == len(non_null):
+                        return parsed
         
         return series
 
-    def save_to_database(self, df: pd.DataFrame, file_name: str):
+    def missing_as_null(self, series: pd.Series) -> pd.Series:
+        """Replace the strings Arrow's CSV reader treats as missing with nulls"""
+        return series.mask(series.isin(_NULL_VALUES))
+
+    def parse_dates(self, series: pd.Series, date_format: str) -> pd.Series:
+        """Parse strings in a single format into an Arrow-backed timestamp column"""
+        return pd.to_datetime(series, errors='coerce', format=date_format).astype(_KIND_DTYPES['datetime'])
+
+    def bulk_load(self, conn, df: pd.DataFrame, table_name: str, columns: List[str]):
+        """Bulk load a DataFrame into a table with LOAD DATA LOCAL INFILE"""
+        variables = [f"@v{i}" for i in range(len(columns))]
+        arrays = []
+        assignments = []
+        for column, variable, (_, series) in zip(columns, variables, df.items()):
+            array = self.to_load_array(series)
+            if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+                # Nulls and empty strings both reach MySQL as '', so valid strings carry a
+                # one-character prefix that is stripped again on load; the string scalars
+                # can't be joined with large_string arrays (e.g. from pandas StringDtype)
+                array = pc.binary_join_element_wise('.', array.cast(pa.string()), '')
+                assignments.append(f"`{column}` = IF({variable} = '', NULL, SUBSTRING({variable}, 2))")
+            else:
+                assignments.append(f"`{column}` = NULLIF({variable}, '')")
+            arrays.append(array)
+        
+        # Write the payload column by column from the Arrow buffers; pyarrow's C++
+        # CSV writer needs no intermediate DataFrame or per-row Python objects
+        table = pa.table(arrays, names=variables)
+        
+        # LOAD DATA needs a file path, so spool the rows to a temporary CSV
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as tmp:
+            pacsv.write_csv(table, tmp, write_options=pacsv.WriteOptions(include_header=False))
         try:
-            if not self.test_connection():
-                raise Exception("Database connection test failed")
-            
-            engine = create_engine(self.get_database_url())
-            
-            # Melt the dataframe to convert columns to rows
-            melted_df = df.melt(var_name='data_column', value_name='data_value')
-            melted_df['source_file'] = file_name
+            # pyarrow doubles embedded quotes rather than escaping them, so backslashes are literal
+            conn.exec_driver_sql(f"""
+                LOAD DATA LOCAL INFILE '{tmp.name}'
+                INTO TABLE `{table_name}`
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+                LINES TERMINATED BY '\\n'
+                ({", ".join(variables)})
+                SET {", ".join(assignments)}
+            """)
+        finally:
+            os.unlink(tmp.name)
+        
+        # LOAD DATA LOCAL behaves like IGNORE: bad values are clamped or truncated and
+        # only reported as warnings, so treat any warning as a failed load
+        warnings = [row for row in conn.exec_driver_sql("SHOW WARNINGS").fetchall() if row[0] != 'Note']
+        if warnings:
+            details = "; ".join(row[2] for row in warnings[:5])
+            raise ValueError(f"Loading into {table_name} raised {len(warnings)} warning(s): {details}")
+
+    def to_load_array(self, series: pd.Series):
+        """Convert a column to the Arrow array written to the LOAD DATA payload"""
+        try:
+            array = pa.array(series, from_pandas=True)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            # Mixed-type object columns are written in their string form
+            array = pa.array(series.astype(str).where(series.notna()), from_pandas=True)
+        
+        if pa.types.is_boolean(array.type):
+            # MySQL reads BOOLEAN columns as integers, not true/false
+            array = array.cast(pa.int8())
+        elif pa.types.is_timestamp(array.type):
+            # DATETIME(6) holds at most microseconds
+            array = array.cast(pa.timestamp('us'), safe=False)
+        return array
+
+    def save_to_database(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], file_name: str):
+        try:
+            # Each file is stored in its own table, created by create_table_from_dataframe
+            table_name = sanitize_table_name(os.path.splitext(file_name)[0])
+            chunks = [data] if isinstance(data, pd.DataFrame) else data
 
             # Save data to the table
             self.logger.info(f"Saving data from file: {file_name}")
-            melted_df.to_sql(
-                name='all_data',
-                con=engine,
-                if_exists='append',
-                index=False
-            )
+            records = 0
+            # One transaction per file, committed once when the block exits
+            with self.engine.begin() as conn:
+                # Defer uniqueness and foreign key checks while bulk loading (InnoDB session flags)
+                conn.exec_driver_sql("SET unique_checks=0, foreign_key_checks=0")
+                try:
+                    for df in chunks:
+                        columns = sanitize_column_names(df.columns)
+                        self.bulk_load(conn, df, table_name, columns)
+                        records += len(df)
+                finally:
+                    # Restore before the connection goes back to the pool
+                    conn.exec_driver_sql("SET unique_checks=1, foreign_key_checks=1")
             
-            self.logger.info(f"Successfully saved {len(df)} records from {file_name}")
+            self.logger.info(f"Successfully saved {records} records to table {table_name}")
             
         except Exception as e:
             self.logger.error(f"Error saving data from file {file_name}: {str(e)}")
             raise
 
+class NewFileHandler(FileSystemEventHandler):
+    """Dispatches data files to a worker pool once they are fully written"""
+    def __init__(self, executor: ThreadPoolExecutor, ingest, data_dir: str):
+        self.executor = executor
+        self.ingest = ingest
+        self.data_dir = os.path.abspath(data_dir)
+        # Files queued or being ingested; a file can be reported by several events and the startup listing
+        self.in_flight = set()
+        self.lock = threading.Lock()
+        self.logger = logger  # Use the global logger
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.submit(event.src_path)
+
+    def on_moved(self, event):
+        # Files renamed into place (e.g. finished downloads) only show up as the move destination
+        if not event.is_directory:
+            self.submit(event.dest_path)
+
+    def on_closed(self, event):
+        # Only emitted where the platform reports closes (inotify), once the writer is done
+        if not event.is_directory:
+            self.submit(event.src_path)
+
+    def submit(self, file_path: str):
+        """Queue a data file in the monitored directory for ingestion"""
+        # Ignore files moved out of the directory (e.g. into done/)
+        if os.path.dirname(os.path.abspath(file_path)) != self.data_dir:
+            return
+        filename = os.path.basename(file_path)
+        if not filename.endswith(('.xlsx', '.xls', '.csv')):
+            return
+        with self.lock:
+            if filename in self.in_flight:
+                return
+            self.in_flight.add(filename)
+        self.logger.info(f"Found new file to process: {filename}")
+        self.executor.submit(self.process, file_path)
+
+    def process(self, file_path: str):
+        """Wait for the file to be fully written, then ingest it; runs on a worker thread"""
+        filename = os.path.basename(file_path)
+        try:
+            if self.wait_until_complete(file_path):
+                self.ingest(filename)
+        finally:
+            with self.lock:
+                self.in_flight.discard(filename)
+
+    @staticmethod
+    def wait_until_complete(file_path: str) -> bool:
+        """Block until the file's size stops changing; False if the file disappears meanwhile"""
+        size = -1
+        while True:
+            try:
+                current = os.path.getsize(file_path)
+            except FileNotFoundError:
+                return False
+            if current == size:
+                return True
+            size = current
+            time.sleep(FILE_SETTLE_SECONDS)
+
 def main():
     # MySQL configuration
     mysql_config = {
@@ -263,56 +793,66 @@ def main():
         test_conn = mysql.connector.connect(
             host=mysql_config['host'],
             user=mysql_config['user'],
-            password=mysql_config['password']
+            password=mysql_config['password'],
+            **CONNECT_OPTIONS
         )
         test_conn.close()
         
+        # Initialize processor
+        processor = DataFileProcessor(mysql_config, '')
+        
         # Setup test environment
         logger.info("Setting up test environment...")
-        setup = MySQLTestSetup(mysql_config)
+        setup = MySQLTestSetup(mysql_config, processor.engine)
         setup.create_database()
-        setup.create_generic_table()
-        
-        # Initialize processor
-        processor = DataFileProcessor(mysql_config, '')
         
         # Directory to monitor
         data_dir = "/Users/shivraj/Downloads/data/"
         
-        # Keep track of processed files
-        processed_files = set()
+        # Loaded files are moved here, so the data directory only holds pending files
+        done_dir = os.path.join(data_dir, 'done')
+        os.makedirs(done_dir, exist_ok=True)
+        
+        def ingest(filename: str):
+            """Parse a file and load it into its table; runs on a worker thread"""
+            file_path = os.path.join(data_dir, filename)
+            try:
+                # Stream the file so large CSVs are loaded without being held in memory
+                chunks = processor.process_file_chunks(file_path)
+                df = next(chunks, None)
+                if df is not None:
+                    # The first chunk only sizes the columns when it is the whole file;
+                    # otherwise later chunks could hold longer strings or larger integers
+                    second = next(chunks, None)
+                    setup.create_table_from_dataframe(df, os.path.splitext(filename)[0], size_from_data=second is None)
+                    if second is not None:
+                        chunks = chain([second], chunks)
+                    processor.save_to_database(chain([df], chunks), filename)
+                    os.replace(file_path, os.path.join(done_dir, filename))
+                    logger.info(f"Successfully processed and saved {filename}")
+            except Exception as e:
+                logger.error(f"Error processing {filename}: {str(e)}")
         
         logger.info(f"Starting to monitor directory: {data_dir}")
         
-        while True:
-            # Get list of files in the directory
-            current_files = set(os.listdir(data_dir))
-            
-            # Find new files
-            new_files = current_files - processed_files
-            
-            if new_files:
-                logger.info(f"Found {len(new_files)} new file(s) to process.")
-                
-                for filename in new_files:
-                    if filename.endswith(('.xlsx', '.xls', '.csv')):
-                        file_path = os.path.join(data_dir, filename)
-                        try:
-                            df = processor.process_file(file_path)
-                            if df is not None:
-                                processor.save_to_database(df, filename)
-                                logger.info(f"Successfully processed and saved {filename}")
-                        except Exception as e:
-                            logger.error(f"Error processing {filename}: {str(e)}")
-                        
-                        # Mark file as processed
-                        processed_files.add(filename)
-            
-            else:
-                logger.info("No new files to process.")
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        # React to filesystem events instead of polling the directory
+        handler = NewFileHandler(executor, ingest, data_dir)
+        observer = Observer()
+        observer.schedule(handler, data_dir, recursive=False)
+        observer.start()
+        try:
+            # Pick up files left pending while the monitor wasn't running
+            for filename in os.listdir(data_dir):
+                handler.submit(os.path.join(data_dir, filename))
             
-            # Wait for a specified interval before checking again
-            time.sleep(60)  # Check every 60 seconds
+            while True:
+                time.sleep(1)
+        finally:
+            observer.stop()
+            observer.join()
+            # Don't block Ctrl+C on queued files; they are picked up again on the next start
+            executor.shutdown(wait=False, cancel_futures=True)
             
     except KeyboardInterrupt:
         logger.info("Program stopped by user.")